@@ -1,14 +1,19 @@
 import os
 import json
+import hashlib
+import re
+import asyncio
+import threading
 import streamlit as st
-from openai import OpenAI
-from supabase import create_client, Client
-from io import StringIO
-from tempfile import NamedTemporaryFile
-import time
-import PyPDF2
-import docx2txt
-from dotenv import load_dotenv
+import tiktoken
+from openai import OpenAI, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
+from tenacity import retry, wait_random_exponential, stop_after_attempt, retry_if_exception_type
+from supabase import create_client, acreate_client, Client
+import psycopg
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pdf_text import extract_pdf_text
+from docx import Document
 
 def get_env_variable(var_name):
   try:
@@ -25,116 +30,40 @@ if not openai_api_key or not supabase_url or not supabase_key or not assistant_i
     st.error("API keys, credentials, or assistant ID are not properly set.")
     st.stop()
 
-client = OpenAI(api_key=openai_api_key)
-
-# Retrieve Assistant
-st.session_state.assistant = client.beta.assistants.retrieve(assistant_id)
-
-# Session state for chat
-if "messages" not in st.session_state:
-    st.session_state.messages = []
-
-# Display chat messages
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        st.markdown(message["content"])
-
-# Chat input
-if prompt := st.chat_input("What is your question?"):
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    with st.chat_message("user"):
-        st.markdown(prompt)
-
-    # Create a new thread for each conversation
-    thread = client.beta.threads.create()
-
-    # Add user message to the thread
-    client.beta.threads.messages.create(
-        thread_id=thread.id,
-        role="user",
-        content=prompt
-    )
-
-    # Run the assistant
-    run = client.beta.threads.runs.create(
-        thread_id=thread.id,
-        assistant_id=st.session_state.assistant.id,
-    )
-
-    # Wait for the run to complete
-    while run.status != "completed":
-        run = client.beta.threads.runs.retrieve(thread_id=thread.id, run_id=run.id)
-
-    # Retrieve and display the assistant's response
-    messages = client.beta.threads.messages.list(thread_id=thread.id)
-    assistant_message = messages.data[0].content[0].text.value
-
-    st.session_state.messages.append({"role": "assistant", "content": assistant_message})
-    with st.chat_message("assistant"):
-        st.markdown(assistant_message)
-
-# Initialise Supabase client
-supabase: Client = create_client(supabase_url, supabase_key)
-
-# Streamlit app
-st.title("OSCE Station Uploader and Parser")
-
-st.write("""
-This app allows you to upload multiple PDF, DOCX, or TXT files.
-It will parse the content via the OpenAI API and convert it into the JSON
-format required for the staticOSCE table, then upload it to Supabase.
-""")
-
-uploaded_files = st.file_uploader(
-    "Upload PDF, DOCX, or TXT files",
-    type=["pdf", "docx", "txt"],
-    accept_multiple_files=True
-)
-
-if uploaded_files:
-    data_list = []
-    any_errors = False
-
-    for uploaded_file in uploaded_files:
-        file_name = uploaded_file.name
-        st.write(f"Processing **{file_name}**...")
-
-        # Read the file content based on its type
-        try:
-            if uploaded_file.type == "application/pdf":
-                with NamedTemporaryFile(delete=False, suffix=".pdf") as temp_pdf:
-                    temp_pdf.write(uploaded_file.read())
-                    temp_pdf.flush()
-                    reader = PyPDF2.PdfReader(temp_pdf.name)
-                    text_content = ""
-                    for page in reader.pages:
-                        text_content += page.extract_text()
-            elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                with NamedTemporaryFile(delete=False, suffix=".docx") as temp_docx:
-                    temp_docx.write(uploaded_file.read())
-                    temp_docx.flush()
-                    text_content = docx2txt.process(temp_docx.name)
-            elif uploaded_file.type == "text/plain":
-                stringio = StringIO(uploaded_file.getvalue().decode("utf-8"))
-                text_content = stringio.read()
-            else:
-                st.error(f"Unsupported file type: {uploaded_file.type}")
-                continue
-        except Exception as e:
-            st.error(f"Error reading {file_name}: {e}")
-            any_errors = True
-            continue
-
-        # Use OpenAI API to parse the content
-        max_retries = 3
-        retry_delay = 5
-
-        for attempt in range(max_retries):
-            try:
-                full_text_content = text_content
-
-                # Craft prompt for OSCE station data
-                prompt = f"""
+# Batched Supabase upserts
+UPSERT_BATCH_SIZE = 500
+UPSERT_CONCURRENCY = int(os.getenv("UPSERT_CONCURRENCY", 16))
+
+# Optional direct Postgres connection for bulk uploads
+supabase_db_url = get_env_variable("SUPABASE_DB_URL")
+COPY_THRESHOLD = 500
+STATION_COLUMNS = [
+    "actorBrief",
+    "examinerBrief",
+    "markscheme",
+    "category",
+    "stationName",
+    "candidateBrief",
+    "module",
+    "OSCE_prompt"
+]
+
+# Parse with the cheaper model first, falling back to the stronger one
+MODEL_CHEAP = "gpt-4o-mini"
+MODEL_STRONG = "gpt-4o"
+REQUIRED_KEYS = set(STATION_COLUMNS)
+
+# Documents longer than this are split into stations and parsed separately
+CHUNK_MIN_CHARS = 20000
+STATION_HEADER = re.compile(r"^[ \t]*(Actor|Examiner|Candidate)\s*Brief", re.IGNORECASE | re.MULTILINE)
+# A title names the station with a number or letter, e.g. "Station 2: Headache"
+STATION_TITLE = re.compile(r"^[ \t]*(?:OSCE[ \t]+)?(?:[Ss]tation|[Cc]ase|[Ss]cenario|STATION|CASE|SCENARIO)[ \t]*(?:\d+|[A-Z])\b")
+TITLE_MAX_CHARS = 100
+PARSE_CONCURRENCY = int(os.getenv("PARSE_CONCURRENCY", 8))
+MAX_PROMPT_TOKENS = 120000
+
+# Prompt for OSCE station data; {text} is filled with the extracted file text
+PROMPT_TEMPLATE = """
 You are provided text describing one or more OSCE stations. You must extract and parse
 the following fields for each station:
 
@@ -173,62 +102,388 @@ The output format should look like this:
     "category": "...",
     "stationName": "...",
     "candidateBrief": "...",
-    "module: "...",
-    "OSCE_prompt: "..."
+    "module": "...",
+    "OSCE_prompt": "..."
   }}
 }}
 
 Now parse the following text and produce the JSON with exactly those keys, retaining everything:
 
-{full_text_content}
-                """
-
-                response = client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a helpful assistant that extracts OSCE station data from text and formats it as JSON."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    temperature=0,
-                    max_tokens=None
-                )
-
-                # Parse the JSON output from OpenAI
-                json_response = response.choices[0].message.content.strip()
-
-                # Clean any ```json fences
-                json_response = json_response.replace("```json", "").replace("```", "").strip()
-
-                parsed_data = json.loads(json_response)
-                if isinstance(parsed_data, dict):
-                    for key, station_data in parsed_data.items():
-                        data_list.append(station_data)
-                else:
-                    # If somehow not a dict, just append directly
-                    data_list.append(parsed_data)
+{text}
+"""
 
-                st.success(f"Successfully parsed **{file_name}**.")
-                break
+@st.cache_resource
+def get_openai_client():
+    return OpenAI(api_key=openai_api_key)
 
-            except json.JSONDecodeError as json_error:
-                if attempt < max_retries - 1:
-                    st.warning(f"Error parsing JSON for {file_name}. Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                else:
-                    st.error(f"Error parsing JSON for {file_name} after {max_retries} attempts: {json_error}")
-                    st.error(f"Raw response: {json_response}")
-                    any_errors = True
+client = get_openai_client()
+
+@retry(
+    wait=wait_random_exponential(min=1, max=60),
+    stop=stop_after_attempt(6),
+    retry=retry_if_exception_type((RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)),
+    reraise=True
+)
+def create_completion(**kwargs):
+    # Retry transient OpenAI errors (429, 5xx, timeouts) with jittered backoff;
+    # the SDK's own retries are off here so tenacity is the only layer
+    return client.with_options(max_retries=0).chat.completions.create(**kwargs)
+
+# Retrieve Assistant once per process; it does not change between reruns
+@st.cache_resource
+def get_assistant():
+    return client.beta.assistants.retrieve(assistant_id)
+
+@st.cache_resource
+def get_system_prompt():
+    return get_assistant().instructions or ""
+
+# Session state for chat
+if "messages" not in st.session_state:
+    st.session_state.messages = []
+
+# Display chat messages
+for message in st.session_state.messages:
+    with st.chat_message(message["role"]):
+        st.markdown(message["content"])
+
+# Chat input
+if prompt := st.chat_input("What is your question?"):
+    st.session_state.messages.append({"role": "user", "content": prompt})
+    with st.chat_message("user"):
+        st.markdown(prompt)
+
+    # Answer with the assistant's model and instructions, sending the full history
+    stream = create_completion(
+        model=get_assistant().model,
+        messages=[
+            {"role": "system", "content": get_system_prompt()},
+            *st.session_state.messages
+        ],
+        stream=True
+    )
+    with st.chat_message("assistant"):
+        assistant_message = st.write_stream(
+            chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices
+        )
 
-            except Exception as e:
-                st.error(f"Error processing {file_name}: {e}")
-                any_errors = True
-                break
+    st.session_state.messages.append({"role": "assistant", "content": assistant_message})
+
+# Initialise Supabase client once per process so its connection pool is reused
+@st.cache_resource
+def get_supabase() -> Client:
+    return create_client(supabase_url, supabase_key)
+
+async def upsert_batches(batches, progress):
+    """Upsert several batches into staticOSCE concurrently.
+
+    Returns one response or exception per batch, in the order given.
+    If the client cannot be created, that error is returned for every batch.
+    """
+    try:
+        async_client = await acreate_client(supabase_url, supabase_key)
+    except Exception as e:
+        progress.progress(1.0)
+        return [e] * len(batches)
+
+    semaphore = asyncio.Semaphore(UPSERT_CONCURRENCY)
+    total = sum(len(batch) for batch in batches)
+    uploaded = 0
+
+    async def upsert(batch):
+        nonlocal uploaded
+        async with semaphore:
+            try:
+                return await async_client.table("staticOSCE").upsert(
+                    batch,
+                    on_conflict="id"  # or any unique column
+                ).execute()
+            finally:
+                uploaded += len(batch)
+                progress.progress(uploaded / total)
+
+    try:
+        return await asyncio.gather(*(upsert(batch) for batch in batches), return_exceptions=True)
+    finally:
+        # A new client is created per upload, so release its connection pool
+        await async_client.postgrest.aclose()
+
+def copy_stations(records):
+    """Bulk load station records into staticOSCE with COPY.
+
+    Parsed stations carry no id, so this inserts the same rows the
+    PostgREST upsert would, without per-request JSON and HTTP overhead.
+    Raises ValueError without loading anything if a record's keys are not
+    exactly REQUIRED_KEYS.
+    """
+    # COPY would silently drop extra keys and NULL missing ones, so reject
+    # anything that isn't exactly a station before loading any rows
+    invalid = [
+        i for i, record in enumerate(records)
+        if not isinstance(record, dict) or set(record) != REQUIRED_KEYS
+    ]
+    if invalid:
+        shown = ", ".join(str(i) for i in invalid[:10]) + (", ..." if len(invalid) > 10 else "")
+        raise ValueError(
+            f"{len(invalid)} records do not have exactly the staticOSCE station fields "
+            f"(indices {shown}); nothing was copied."
+        )
+
+    columns = ", ".join(f'"{column}"' for column in STATION_COLUMNS)
+    with psycopg.connect(supabase_db_url) as conn:
+        with conn.cursor() as cur:
+            with cur.copy(f'COPY "staticOSCE" ({columns}) FROM STDIN') as copy:
+                for record in records:
+                    copy.write_row([record[column] for column in STATION_COLUMNS])
+
+# Load the tokenizer once per process; it is large and slow to build
+@st.cache_resource(show_spinner=False)
+def get_encoding():
+    return tiktoken.encoding_for_model(MODEL_STRONG)
+
+# Cached so reruns do not re-encode unchanged text
+@st.cache_data(show_spinner=False)
+def count_prompt_tokens(text):
+    return len(get_encoding().encode(PROMPT_TEMPLATE.format(text=text)))
+
+# File and chunk pools are nested, so bound parse requests in flight
+# across the whole process rather than per pool
+@st.cache_resource
+def get_parse_semaphore():
+    return threading.BoundedSemaphore(PARSE_CONCURRENCY)
+
+parse_semaphore = get_parse_semaphore()
+
+def stations_from_json(json_response):
+    stations = []
+    parsed_data = json.loads(json_response)
+    if isinstance(parsed_data, dict):
+        for key, station_data in parsed_data.items():
+            stations.append(station_data)
+    else:
+        # If somehow not a dict, just append directly
+        stations.append(parsed_data)
+    return stations
+
+def is_complete(stations):
+    return bool(stations) and all(
+        isinstance(station, dict) and set(station) == REQUIRED_KEYS for station in stations
+    )
+
+@st.cache_data(show_spinner=False)
+def parse_stations(content_hash, chunk_index, _text_content, strong_only=False, _fresh_models=None):
+    """Parse OSCE stations from extracted text via the OpenAI API.
+
+    Tries MODEL_CHEAP first and falls back to MODEL_STRONG if its output is
+    not valid JSON or a station is missing fields. Unless ``strong_only`` is
+    set, the model that produced the result is appended to ``_fresh_models``;
+    this only happens on a cache miss, so cached replays are not counted.
+
+    Results are cached on ``content_hash`` (SHA-256 of the uploaded file)
+    and ``chunk_index``, so re-uploading an identical file skips the model call.
+    """
+    prompt = PROMPT_TEMPLATE.format(text=_text_content)
+    models = [MODEL_STRONG] if strong_only else [MODEL_CHEAP, MODEL_STRONG]
+
+    for model in models:
+        with parse_semaphore:
+            response = create_completion(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a helpful assistant that extracts OSCE station data from text and formats it as JSON."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0,
+                max_tokens=None,
+                response_format={"type": "json_object"}
+            )
+
+        # Parse the JSON output from OpenAI
+        try:
+            stations = stations_from_json(response.choices[0].message.content)
+        except json.JSONDecodeError:
+            if model == models[-1]:
+                raise
+            continue
+
+        if model == models[-1] or is_complete(stations):
+            if _fresh_models is not None and not strong_only:
+                _fresh_models.append(model)
+            return stations
+
+@st.cache_data(show_spinner=False)
+def extract_text(file_bytes, file_type):
+    """Extract text from an uploaded file's bytes, or None if the type is unsupported.
+
+    Cached on the file contents so reruns do not re-extract unchanged uploads.
+    """
+    if file_type == "application/pdf":
+        return extract_pdf_text(file_bytes)
+    elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+        document = Document(BytesIO(file_bytes))
+        parts = [paragraph.text for paragraph in document.paragraphs]
+        for table in document.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    parts.append(cell.text)
+        return "\n".join(parts)
+    elif file_type == "text/plain":
+        return file_bytes.decode("utf-8")
+    return None
+
+def block_start(text, header_start, floor):
+    """Move a station split point back to the station's title line, if any.
+
+    Looks at up to two non-blank lines above the header. The split only moves
+    when one of them is a station title; otherwise it stays at the header,
+    so the previous station keeps all of its text.
+    """
+    lines = text[floor:header_start].split("\n")[:-1]
+    checked = 0
+    for i in range(len(lines) - 1, -1, -1):
+        if not lines[i].strip():
+            continue
+        if len(lines[i]) < TITLE_MAX_CHARS and STATION_TITLE.match(lines[i]):
+            start = floor + sum(len(line) + 1 for line in lines[:i])
+            # Never leave the previous station empty
+            return start if start > floor else header_start
+        checked += 1
+        if checked == 2:
+            break
+    return header_start
+
+def split_stations(text):
+    """Split extracted text into one chunk per station.
+
+    Each station is assumed to start with whichever brief header appears
+    first in the document, so that station's other briefs stay with it.
+    The station's title lines above the header stay with it too. Any text
+    before the first header is kept with the first station.
+    """
+    first_header = STATION_HEADER.search(text)
+    if not first_header:
+        return [text]
+
+    station_start = re.compile(rf"^[ \t]*{first_header.group(1)}\s*Brief", re.IGNORECASE | re.MULTILINE)
+    starts = [0]
+    for match in list(station_start.finditer(text))[1:]:
+        starts.append(block_start(text, match.start(), starts[-1]))
+    bounds = starts + [len(text)]
+    chunks = [text[bounds[i]:bounds[i + 1]] for i in range(len(starts))]
+    # An empty prompt makes the model echo the example station, so never send one
+    return [chunk for chunk in chunks if chunk.strip()]
+
+def parse_file(uploaded_file, strong_only=False):
+    """Extract and parse one uploaded file.
+
+    Runs on a worker thread, so Streamlit output is buffered as
+    (level, text) pairs and flushed by the caller on the main thread.
+    """
+    stations = []
+    messages = []
+    fresh_models = []
+    any_errors = False
+
+    file_name = uploaded_file.name
+    content_hash = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    messages.append(("write", f"Processing **{file_name}**..."))
+
+    # Read the file content based on its type
+    try:
+        text_content = extract_text(uploaded_file.getvalue(), uploaded_file.type)
+        if text_content is None:
+            messages.append(("error", f"Unsupported file type: {uploaded_file.type}"))
+            return stations, messages, any_errors, fresh_models
+    except Exception as e:
+        messages.append(("error", f"Error reading {file_name}: {e}"))
+        return stations, messages, True, fresh_models
+
+    # Use OpenAI API to parse the content
+    try:
+        chunks = split_stations(text_content) if len(text_content) > CHUNK_MIN_CHARS else [text_content]
+        token_counts = [count_prompt_tokens(chunk) for chunk in chunks]
+        if len(chunks) == 1 and token_counts[0] > MAX_PROMPT_TOKENS:
+            chunks = split_stations(text_content)
+            token_counts = [count_prompt_tokens(chunk) for chunk in chunks]
+        # Don't send prompts the model is guaranteed to reject
+        if max(token_counts) > MAX_PROMPT_TOKENS:
+            messages.append(("error", f"{file_name} is too long to parse: a station exceeds {MAX_PROMPT_TOKENS} prompt tokens."))
+            return stations, messages, True, fresh_models
+
+        if len(chunks) == 1:
+            stations.extend(parse_stations(content_hash, 0, text_content, strong_only, fresh_models))
+        else:
+            # Parse each station with its own smaller prompt, in parallel.
+            # list() raises if any chunk fails, so a partial file is never kept.
+            with ThreadPoolExecutor(max_workers=min(len(chunks), PARSE_CONCURRENCY)) as executor:
+                results = list(executor.map(
+                    lambda args: parse_stations(content_hash, *args, strong_only, fresh_models),
+                    enumerate(chunks)
+                ))
+            for chunk_stations in results:
+                stations.extend(chunk_stations)
+        messages.append(("success", f"Successfully parsed **{file_name}**."))
+    except json.JSONDecodeError as json_error:
+        messages.append(("error", f"Error parsing JSON for {file_name}: {json_error}"))
+        messages.append(("error", f"Raw response: {json_error.doc}"))
+        any_errors = True
+    except Exception as e:
+        messages.append(("error", f"Error processing {file_name}: {e}"))
+        any_errors = True
+
+    return stations, messages, any_errors, fresh_models
+
+# Streamlit app
+st.title("OSCE Station Uploader and Parser")
+
+st.write("""
+This app allows you to upload multiple PDF, DOCX, or TXT files.
+It will parse the content via the OpenAI API and convert it into the JSON
+format required for the staticOSCE table, then upload it to Supabase.
+""")
+
+uploaded_files = st.file_uploader(
+    "Upload PDF, DOCX, or TXT files",
+    type=["pdf", "docx", "txt"],
+    accept_multiple_files=True
+)
+
+strong_only = st.toggle(
+    f"Always parse with {MODEL_STRONG}",
+    help=f"By default files are parsed with {MODEL_CHEAP}, falling back to {MODEL_STRONG} when its output is incomplete."
+)
+
+if uploaded_files:
+    data_list = []
+    any_errors = False
+    if "model_usage" not in st.session_state:
+        st.session_state.model_usage = {MODEL_CHEAP: 0, MODEL_STRONG: 0}
+    model_usage = st.session_state.model_usage
+
+    # Parse files concurrently; each call is dominated by network I/O
+    with ThreadPoolExecutor(max_workers=PARSE_CONCURRENCY) as executor:
+        futures = [executor.submit(parse_file, uploaded_file, strong_only) for uploaded_file in uploaded_files]
+        for future in as_completed(futures):
+            stations, messages, file_errors, fresh_models = future.result()
+            for level, text in messages:
+                getattr(st, level)(text)
+            data_list.extend(stations)
+            any_errors = any_errors or file_errors
+            for model in fresh_models:
+                model_usage[model] += 1
+
+    # Track how often the cheap model's output was good enough this session
+    if sum(model_usage.values()):
+        st.caption(
+            f"This session, {model_usage[MODEL_CHEAP]} of {sum(model_usage.values())} model parses "
+            f"used {MODEL_CHEAP}; {model_usage[MODEL_STRONG]} fell back to {MODEL_STRONG}."
+        )
 
     if data_list:
         st.write("### Parsed Data:")
@@ -238,25 +493,49 @@ Now parse the following text and produce the JSON with exactly those keys, retai
         if st.button("Upload Data to Supabase"):
             st.write("Uploading data to Supabase...")
             upload_errors = False
-            for record in data_list:
+            progress = st.progress(0.0)
+            if supabase_db_url and len(data_list) > COPY_THRESHOLD:
+                # Large uploads go straight to Postgres with COPY
                 try:
-                    # Upsert each station into staticOSCE table
-                    response = supabase.table("staticOSCE").upsert(
-                        record,
-                        on_conflict="id"  # or any unique column
-                    ).execute()
-
-                    if response.data is not None or len(response.data) > 0:
-                        st.success("Successfully upserted record into staticOSCE table.")
-                    elif hasattr(response, 'error') and response.error:
-                        st.error(f"Error uploading record: {response.error}")
-                        upload_errors = True
-                    else:
-                        st.info("Record processed. No data returned (normal for upsert operations).")
-
+                    copy_stations(data_list)
+                    st.success(f"Successfully copied {len(data_list)} records into staticOSCE table.")
                 except Exception as e:
                     st.error(f"Exception during upload: {e}")
                     upload_errors = True
+                progress.progress(1.0)
+                batches = []
+            else:
+                batches = [
+                    data_list[start:start + UPSERT_BATCH_SIZE]
+                    for start in range(0, len(data_list), UPSERT_BATCH_SIZE)
+                ]
+
+            # Upsert stations in batches; each batch is a single request
+            if len(batches) > 1:
+                results = asyncio.run(upsert_batches(batches, progress))
+            elif batches:
+                try:
+                    results = [get_supabase().table("staticOSCE").upsert(
+                        batches[0],
+                        on_conflict="id"  # or any unique column
+                    ).execute()]
+                except Exception as e:
+                    results = [e]
+                progress.progress(1.0)
+            else:
+                results = []
+
+            for batch, response in zip(batches, results):
+                if isinstance(response, Exception):
+                    st.error(f"Exception during upload: {response}")
+                    upload_errors = True
+                elif response.data:
+                    st.success(f"Successfully upserted {len(batch)} records into staticOSCE table.")
+                elif hasattr(response, 'error') and response.error:
+                    st.error(f"Error uploading records: {response.error}")
+                    upload_errors = True
+                else:
+                    st.info("Records processed. No data returned (normal for upsert operations).")
 
             if not upload_errors:
                 st.success("All data processed successfully.")
@@ -0,0 +1,49 @@
+import os
+import math
+import multiprocessing
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+import PyPDF2
+
+# Below this many pages, process start-up costs more than it saves
+PARALLEL_MIN_PAGES = 8
+
+# Several files may be extracted at once, so keep each pool small
+MAX_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", max(1, min(4, (os.cpu_count() or 1) // 2))))
+
+# Avoid forking the multithreaded Streamlit process
+MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+_reader = None
+
+def _init_worker(pdf_bytes):
+    # Each worker receives the bytes once and parses the PDF once
+    global _reader
+    _reader = PyPDF2.PdfReader(BytesIO(pdf_bytes))
+
+def _extract_page(page_number):
+    return _reader.pages[page_number].extract_text() or ""
+
+def extract_pdf_text(pdf_bytes):
+    """Extract the text of every page in a PDF, joined by newlines.
+
+    Large PDFs are split across a process pool, since extract_text is
+    CPU-bound and holds the GIL.
+    """
+    reader = PyPDF2.PdfReader(BytesIO(pdf_bytes))
+    page_count = len(reader.pages)
+
+    if page_count < PARALLEL_MIN_PAGES or MAX_WORKERS < 2:
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+    workers = min(MAX_WORKERS, page_count)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=MP_CONTEXT,
+        initializer=_init_worker,
+        initargs=(pdf_bytes,)
+    ) as executor:
+        texts = executor.map(_extract_page, range(page_count), chunksize=math.ceil(page_count / workers))
+        return "\n".join(texts)